@@ -34,8 +34,10 @@ class MyCharm(CharmBase):
 You can file bugs [here](https://github.com/canonical/charm-software-inventory-exporter/issues)!
 """
 import socket
-from dataclasses import asdict, dataclass
-from typing import List
+import sys
+from dataclasses import dataclass
+from operator import itemgetter
+from typing import Dict, Iterator, List, Optional, Tuple
 
 from ops.charm import CharmBase, RelationJoinedEvent
 from ops.framework import Object
@@ -49,12 +51,19 @@ LIBAPI = 0
 
 # Increment this PATCH version before using `charmcraft publish-lib` or reset
 # to 0 if you are raising the major API version
-LIBPATCH = 1
+LIBPATCH = 2
 
 DEFAULT_RELATION_NAME = "software-inventory"
 
+# Keys that each Provider unit is expected to set in its relation data
+_REQUIRED_KEYS = ("port", "hostname", "model")
+_extract_required = itemgetter(*_REQUIRED_KEYS)
 
-@dataclass
+# Slotted dataclasses are available only since Python 3.10
+_DATACLASS_OPTIONS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_DATACLASS_OPTIONS)
 class ExporterConfig:
     """Representation of an exporter configuration.
 
@@ -77,29 +86,37 @@ class SoftwareInventoryConsumer(Object):
         self.charm = charm
         self.relation_name = relation_name
 
-    def all_exporters(self) -> List[ExporterConfig]:
-        """Return configuration of all related Software Inventory Exporters.
+    def iter_exporters(self) -> Iterator[ExporterConfig]:
+        """Yield configuration of each related Software Inventory Exporter.
 
-        This configuration can be used to set up collector to scrape data from every
-        exporter.
+        Unlike 'all_exporters', this method does not build the whole list upfront, which
+        is useful when the caller just needs to iterate over the exporters once. Units that
+        did not publish their configuration yet are skipped.
         """
-        exporter_configs = []
-        provider_relations = self.model.relations[self.relation_name]
+        provider_relations = list(self.model.relations[self.relation_name])
 
         for relation in provider_relations:
             for unit in relation.units:
                 remote_data = relation.data[unit]
+                if not all(key in remote_data for key in _REQUIRED_KEYS):
+                    continue
+
+                port, hostname, model = _extract_required(remote_data)
                 ingress = remote_data.get("ingress-address") or remote_data.get("private-address")
-                exporter_configs.append(
-                    ExporterConfig(
-                        port=remote_data["port"],
-                        hostname=remote_data["hostname"],
-                        model=remote_data["model"],
-                        ingress_ip=ingress,
-                    )
+                yield ExporterConfig(
+                    port=port,
+                    hostname=hostname,
+                    model=model,
+                    ingress_ip=ingress,
                 )
 
-        return exporter_configs
+    def all_exporters(self) -> List[ExporterConfig]:
+        """Return configuration of all related Software Inventory Exporters.
+
+        This configuration can be used to set up collector to scrape data from every
+        exporter.
+        """
+        return list(self.iter_exporters())
 
 
 class SoftwareInventoryProvider(Object):
@@ -118,6 +135,9 @@ class SoftwareInventoryProvider(Object):
         self.relation_name = relation_name
         self._port = port
         self._bound_address = bound_address
+        self._hostname = socket.gethostname()
+        self._last_payload: Dict[int, Dict[str, str]] = {}
+        self._last_update: Optional[Tuple[str, str]] = None
         self.framework.observe(charm.on[relation_name].relation_joined, self._on_consumer_joined)
 
     @property
@@ -132,24 +152,44 @@ class SoftwareInventoryProvider(Object):
 
     def _on_consumer_joined(self, event: RelationJoinedEvent) -> None:
         """Set relation data when unit with 'Require' side of the relation joins."""
-        self._update_relation_data(event.relation)
+        self._write_payload(event.relation, self._relation_payload())
 
-    def _update_relation_data(self, relation: Relation) -> None:
-        """Update data in a single relation according to the current config."""
-        host = socket.gethostname()
-        relation_data = ExporterConfig(model=self.model.name, hostname=host, port=self.port)
-        relation.data[self.charm.unit].update(asdict(relation_data))
+    def _relation_payload(self) -> Dict[str, str]:
+        """Return relation data representing the current config."""
+        return {
+            "hostname": self._hostname,
+            "port": self.port,
+            "model": self.model.name,
+        }
+
+    def _write_payload(self, relation: Relation, payload: Dict[str, str]) -> None:
+        """Write payload to the unit's data in a single relation.
+
+        Relation data are not written again if they did not change since the last update.
+        """
+        if self._last_payload.get(relation.id) == payload:
+            return
+
+        relation.data[self.charm.unit].update(payload)
+        self._last_payload[relation.id] = payload
 
     def update_consumers(self, port: str, bound_address: str) -> None:
         """Update relation data in every related unit according to the current config.
 
+        Repeated calls with unchanged values are no-op.
+
         :param port: New value of the port on which the exporter is listening
         :param bound_address: New value of the address on which the exporter is listening
         :return: None
         """
+        if self._last_update == (port, bound_address):
+            return
+
+        self._last_update = (port, bound_address)
         self._port = port
         self._bound_address = bound_address
-        consumer_relations = self.model.relations[self.relation_name]
+        consumer_relations = list(self.model.relations[self.relation_name])
+        payload = self._relation_payload()
 
         for relation in consumer_relations:
-            self._update_relation_data(relation)
+            self._write_payload(relation, payload)
@@ -11,11 +11,11 @@ develop a new k8s charm using the Operator Framework:
 
     https://discourse.charmhub.io/t/4208
 """
+import json
 import logging
 import os
 from typing import Optional, Union
 
-import yaml
 from charms.operator_libs_linux.v1 import snap
 from charms.software_inventory_exporter.v0.software_inventory import SoftwareInventoryProvider
 from ops.charm import (
@@ -33,6 +33,31 @@ logger = logging.getLogger(__name__)
 
 VALID_LOG_LEVELS = ["info", "debug", "warning", "error", "critical"]
 
+EXPORTER_CONF_TEMPLATE = """\
+settings:
+  bind_address: {bind_address}
+  port: {port:d}
+"""
+
+
+def _read_file(path: str) -> Optional[bytes]:
+    """Return raw content of a file or None if the file does not exist."""
+    try:
+        with open(path, "rb") as file:
+            return file.read()
+    except FileNotFoundError:
+        return None
+
+
+def _write_file_atomically(path: str, content: bytes) -> None:
+    """Write content to a file so that readers never see it partially written."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as file:
+        file.write(content)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(tmp_path, path)
+
 
 class SoftwareInventoryExporterCharm(CharmBase):
     """Software Inventory Exporter charm."""
@@ -44,6 +69,10 @@ class SoftwareInventoryExporterCharm(CharmBase):
     def __init__(self, framework: Framework) -> None:
         """Initialize charm."""
         super().__init__(framework)
+        self._snap_path: Optional[str] = None
+        self._snap_path_fetched = False
+        self._snaps: Optional[snap.SnapCache] = None
+        self._exporter_running: Optional[bool] = None
 
         self.framework.observe(self.on.install, self._on_install)
         self.framework.observe(self.on.config_changed, self._on_config_changed)
@@ -62,8 +91,15 @@ class SoftwareInventoryExporterCharm(CharmBase):
 
         If this charm has snap file for the exporter attached as a resource, this property returns
         path to the snap file. If the resource was not attached or the file is empty, this property
-        returns None.
+        returns None. The resource is fetched only once per hook execution.
         """
+        if not self._snap_path_fetched:
+            self._snap_path = self._fetch_snap_path()
+            self._snap_path_fetched = True
+        return self._snap_path
+
+    def _fetch_snap_path(self) -> Optional[str]:
+        """Fetch exporter snap resource and return its local path if it's not empty."""
         try:
             snap_path = str(self.model.resources.fetch("exporter-snap"))
             # Don't return path to empty resource file
@@ -74,11 +110,21 @@ class SoftwareInventoryExporterCharm(CharmBase):
 
         return snap_path
 
+    @property
+    def snaps(self) -> snap.SnapCache:
+        """Return cache of snaps available on the unit.
+
+        The cache is created on the first access, so that hooks that don't interact with
+        snaps don't have to pay for loading it.
+        """
+        if self._snaps is None:
+            self._snaps = snap.SnapCache()
+        return self._snaps
+
     @property
     def exporter(self) -> snap.Snap:
         """Return Snap object representing Software Inventory Exporter snap."""
-        cache = snap.SnapCache()
-        return cache[self.EXPORTER_SNAP_NAME]
+        return self.snaps[self.EXPORTER_SNAP_NAME]
 
     def _on_install(self, _: Union[InstallEvent, UpgradeCharmEvent]) -> None:
         """Install Software Inventory Exporter snap.
@@ -89,17 +135,19 @@ class SoftwareInventoryExporterCharm(CharmBase):
             snap.install_local(self.snap_path, dangerous=True)
         else:
             self.exporter.ensure(snap.SnapState.Latest)
+        self._exporter_running = None
 
         self.reconfigure_exporter()
         self.assess_status()
 
     def _on_config_changed(self, _: ConfigChangedEvent) -> None:
         """Update exporter configuration and update related applications."""
-        port = self.config["port"]
+        # Relation data can hold only strings, while the exporter config uses integer port
+        port = str(self.config["port"])
         address = self.config["bind_address"]
 
         self.reconfigure_exporter()
-        self.provider_endpoint.update_consumers(str(port), address)
+        self.provider_endpoint.update_consumers(port, address)
         self.assess_status()
 
     def _on_update_status(self, _: UpdateStatusEvent) -> None:
@@ -107,19 +155,31 @@ class SoftwareInventoryExporterCharm(CharmBase):
         self.assess_status()
 
     def reconfigure_exporter(self) -> None:
-        """Render new exporter config and restart its service."""
-        self.render_exporter_config()
-        self.exporter.restart()
-
-    def render_exporter_config(self) -> None:
-        """Generate new exporter config based on the charm config and save it to file."""
-        settings = {
-            "bind_address": self.config["bind_address"],
-            "port": int(self.config["port"]),
-        }
-        config = {"settings": settings}
-        with open(self.EXPORTER_CONF, "w", encoding="UTF-8") as conf_file:
-            yaml.safe_dump(config, conf_file)
+        """Render new exporter config and restart its service if the config changed."""
+        if self.render_exporter_config():
+            self.exporter.restart()
+            self._exporter_running = None
+        else:
+            logger.debug("Exporter config did not change, skipping service restart.")
+
+    def render_exporter_config(self) -> bool:
+        """Generate new exporter config based on the charm config and save it to file.
+
+        The file is replaced atomically and only if its content changed.
+
+        :return: True if the config file was (re)written, otherwise False
+        """
+        # JSON string is a valid YAML scalar, so it's used to safely quote the address
+        rendered = EXPORTER_CONF_TEMPLATE.format(
+            bind_address=json.dumps(self.config["bind_address"]),
+            port=self.config["port"],
+        ).encode("UTF-8")
+
+        changed = rendered != _read_file(self.EXPORTER_CONF)
+        if changed:
+            _write_file_atomically(self.EXPORTER_CONF, rendered)
+
+        return changed
 
     def assess_status(self) -> None:
         """Set charm status based on the status of the exporter service."""
@@ -134,8 +194,14 @@ class SoftwareInventoryExporterCharm(CharmBase):
             )
 
     def is_exporter_running(self) -> bool:
-        """Return true if exporter's service is running."""
-        return self.exporter.services[self.EXPORTER_SNAP_NAME]["active"]
+        """Return true if exporter's service is running.
+
+        The state of the service is checked only once per hook, unless the service is
+        (re)installed or restarted by the charm.
+        """
+        if self._exporter_running is None:
+            self._exporter_running = self.exporter.services[self.EXPORTER_SNAP_NAME]["active"]
+        return self._exporter_running
 
 
 if __name__ == "__main__":  # pragma: nocover
@@ -6,8 +6,8 @@
 
 import ops.testing
 import pytest
-from ops.charm import CharmEvents
-from ops.framework import EventBase, EventSource
+from ops.charm import CharmEvents, RelationJoinedEvent
+from ops.framework import EventSource
 
 from charm import CharmBase, SoftwareInventoryExporterCharm
 
@@ -15,7 +15,7 @@ from charm import CharmBase, SoftwareInventoryExporterCharm
 class SoftwareInventoryEvents(CharmEvents):
     """Custom event handler for Testing charm."""
 
-    software_inventory_relation_joined = EventSource(EventBase)
+    software_inventory_relation_joined = EventSource(RelationJoinedEvent)
 
 
 class GenericCharm(CharmBase):
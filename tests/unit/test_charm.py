@@ -3,9 +3,11 @@
 #
 # Learn more about testing at: https://juju.is/docs/sdk/testing
 """Unit tests for src/charm.py module."""
-from unittest.mock import MagicMock, PropertyMock, mock_open, patch
+import os
+from unittest.mock import MagicMock, PropertyMock, patch
 
 import pytest
+import yaml
 
 import charm
 
@@ -21,6 +23,17 @@ def test_snap_path_property(resource_size, harness, mocker):
     assert harness.charm.snap_path == expected_path
 
 
+def test_snap_path_property_cached(harness, mocker):
+    """Test that `snap_path` property fetches the resource only once."""
+    fetch_mock = mocker.patch.object(
+        harness.charm.model.resources, "fetch", return_value="/path/to/resource"
+    )
+    mocker.patch.object(charm.os.path, "getsize", return_value=100)
+
+    assert harness.charm.snap_path == harness.charm.snap_path
+    fetch_mock.assert_called_once_with("exporter-snap")
+
+
 def test_snap_path_property_not_attached(harness, mocker):
     """Test that `snap_path` property returns path only if valid resource is attached."""
     mocker.patch.object(harness.charm.model.resources, "fetch", side_effect=charm.ModelError)
@@ -39,6 +52,14 @@ def test_exporter_property(harness, mocker):
     assert harness.charm.exporter == exporter_snap
 
 
+def test_snaps_property(harness, mocker):
+    """Test that 'snaps' property loads the snap cache only once."""
+    snap_cache_mock = mocker.patch.object(charm.snap, "SnapCache")
+
+    assert harness.charm.snaps is harness.charm.snaps
+    snap_cache_mock.assert_called_once_with()
+
+
 @patch.object(charm.SoftwareInventoryExporterCharm, "snap_path", PropertyMock)
 @pytest.mark.parametrize("local_snap_path", [None, "path/to/resource.snap"])
 def test_on_install_local_resource(local_snap_path, harness, mocker):
@@ -89,34 +110,85 @@ def test_snap_config(harness, mocker):
 
 
 @patch.object(charm.SoftwareInventoryExporterCharm, "exporter", PropertyMock)
-def test_reconfigure_exporter(harness, mocker):
-    """Test helper function that updates config and restarts exporter service."""
-    render_config_mock = mocker.patch.object(harness.charm, "render_exporter_config")
+@pytest.mark.parametrize("config_changed", [True, False])
+def test_reconfigure_exporter(config_changed, harness, mocker):
+    """Test helper function that updates config and restarts exporter service if needed."""
+    render_config_mock = mocker.patch.object(
+        harness.charm, "render_exporter_config", return_value=config_changed
+    )
     exporter_snap = MagicMock()
     harness.charm.exporter = exporter_snap
 
     harness.charm.reconfigure_exporter()
 
     render_config_mock.assert_called_once()
-    exporter_snap.restart.assert_called_once()
+    if config_changed:
+        exporter_snap.restart.assert_called_once()
+    else:
+        exporter_snap.restart.assert_not_called()
+
 
+@pytest.fixture()
+def exporter_conf(harness, tmp_path, mocker):
+    """Redirect exporter's config file to a temporary directory."""
+    conf_path = str(tmp_path / "config.yaml")
+    mocker.patch.object(harness.charm, "EXPORTER_CONF", conf_path)
+    return conf_path
 
-def test_render_exporter_config(harness, mocker):
+
+@pytest.mark.parametrize("bind_address", ["0.0.0.0", "::", "10.0.0.1 # comment", 'a"b: c'])
+def test_render_exporter_config(bind_address, harness, exporter_conf):
     """Test function that renders exporter's configuration file."""
-    yaml_dump_mock = mocker.patch.object(charm.yaml, "safe_dump")
+    with harness.hooks_disabled():
+        harness.update_config({"bind_address": bind_address})
     expected_config = {
         "settings": {
-            "bind_address": harness.charm.config.get("bind_address"),
+            "bind_address": bind_address,
             "port": harness.charm.config.get("port"),
         }
     }
 
-    open_file_function = mock_open()
-    with patch("builtins.open", open_file_function) as file_open_mock:
-        harness.charm.render_exporter_config()
-        file_open_mock.assert_called_once_with(harness.charm.EXPORTER_CONF, "w", encoding="UTF-8")
+    assert harness.charm.render_exporter_config()
+
+    with open(exporter_conf, "r", encoding="UTF-8") as conf_file:
+        assert yaml.safe_load(conf_file) == expected_config
+    assert not os.path.exists(f"{exporter_conf}.tmp")
+
+
+def test_render_exporter_config_unchanged(harness, exporter_conf, mocker):
+    """Test that exporter's config file is not rewritten if its content would not change."""
+    replace_spy = mocker.spy(charm.os, "replace")
+    fsync_spy = mocker.spy(charm.os, "fsync")
+
+    assert harness.charm.render_exporter_config()
+    conf_mtime = os.stat(exporter_conf).st_mtime_ns
+    assert not harness.charm.render_exporter_config()
 
-    yaml_dump_mock.assert_called_once_with(expected_config, open_file_function())
+    replace_spy.assert_called_once()
+    assert os.stat(exporter_conf).st_mtime_ns == conf_mtime
+    assert fsync_spy.call_count == 1
+
+    with harness.hooks_disabled():
+        harness.update_config({"port": 10099})
+    assert harness.charm.render_exporter_config()
+
+
+@pytest.mark.parametrize("drifted_content", [b"settings:\n  port: 1\n", b"\xff\xfe garbage"])
+def test_render_exporter_config_repairs_drift(drifted_content, harness, exporter_conf):
+    """Test that exporter's config is rewritten if the file on the disk was changed."""
+    assert harness.charm.render_exporter_config()
+    with open(exporter_conf, "wb") as conf_file:
+        conf_file.write(drifted_content)
+
+    assert harness.charm.render_exporter_config()
+
+    with open(exporter_conf, "r", encoding="UTF-8") as conf_file:
+        assert yaml.safe_load(conf_file) == {
+            "settings": {
+                "bind_address": harness.charm.config["bind_address"],
+                "port": harness.charm.config["port"],
+            }
+        }
 
 
 @patch.object(
@@ -146,6 +218,23 @@ def test_is_exporter_running(exporter, exporter_running, harness):
     assert harness.charm.is_exporter_running() == exporter_running
 
 
+@patch.object(charm.SoftwareInventoryExporterCharm, "exporter", new_callable=PropertyMock)
+def test_is_exporter_running_cached(exporter, harness, mocker):
+    """Test that exporter's service state is cached until the service is restarted."""
+    exporter_snap_mock = MagicMock()
+    exporter_snap_mock.services = {harness.charm.EXPORTER_SNAP_NAME: {"active": False}}
+    exporter.return_value = exporter_snap_mock
+    mocker.patch.object(harness.charm, "render_exporter_config", return_value=True)
+
+    assert not harness.charm.is_exporter_running()
+    exporter_snap_mock.services = {harness.charm.EXPORTER_SNAP_NAME: {"active": True}}
+    assert not harness.charm.is_exporter_running()
+
+    harness.charm.reconfigure_exporter()
+
+    assert harness.charm.is_exporter_running()
+
+
 def test_on_update_status(harness, mocker):
     """Test that _on_update method triggers unit status assessment."""
     assess_status_mock = mocker.patch.object(harness.charm, "assess_status")
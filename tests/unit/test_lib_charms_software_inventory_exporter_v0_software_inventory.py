@@ -4,8 +4,10 @@
 # Learn more about testing at: https://juju.is/docs/sdk/testing
 """Unit tests for lib/charms/software_inventory_provider/v0/software_inventory.py module."""
 from dataclasses import asdict
+from types import GeneratorType
 from unittest.mock import MagicMock, call
 
+import pytest
 from charms.software_inventory_exporter.v0 import software_inventory
 from charms.software_inventory_exporter.v0.software_inventory import (
     ExporterConfig,
@@ -14,6 +16,11 @@ from charms.software_inventory_exporter.v0.software_inventory import (
 )
 
 
+def _cfg(hostname: str, port: str, model: str) -> dict:
+    """Return relation data that Provider unit sets for the given exporter config."""
+    return {"hostname": hostname, "port": port, "model": model}
+
+
 def test_provider_init():
     """Test initialization of a Provider endpoint."""
     relation_name = "my-relation"
@@ -32,16 +39,37 @@ def test_provider_on_consumer_joined(mocker):
     event_mock = MagicMock()
     relation_mock = MagicMock()
     event_mock.relation = relation_mock
-    update_relation_mock = mocker.patch.object(SoftwareInventoryProvider, "_update_relation_data")
+    payload = _cfg("test.machine.0", "8675", "test_model")
+    mocker.patch.object(SoftwareInventoryProvider, "_relation_payload", return_value=payload)
+    write_payload_mock = mocker.patch.object(SoftwareInventoryProvider, "_write_payload")
 
     endpoint = SoftwareInventoryProvider(MagicMock())
     endpoint._on_consumer_joined(event_mock)
 
-    update_relation_mock.assert_called_once_with(relation_mock)
+    write_payload_mock.assert_called_once_with(relation_mock, payload)
+
+
+def test_provider_consumer_joined_sets_relation_data(generic_charm_harness, mocker):
+    """Test that relation data are set as soon as consumer unit joins the relation."""
+    hostname = "test.machine.0"
+    mocker.patch.object(software_inventory.socket, "gethostname", return_value=hostname)
+    endpoint = SoftwareInventoryProvider(charm=generic_charm_harness.charm)
+
+    with generic_charm_harness.hooks_disabled():
+        rel_id = generic_charm_harness.add_relation("software-inventory", "collector")
+    generic_charm_harness.add_relation_unit(rel_id, "collector/0")
+
+    local_unit = generic_charm_harness.charm.unit.name
+    expected_data = _cfg(hostname, endpoint.port, endpoint.model.name)
+    assert expected_data == generic_charm_harness.get_relation_data(rel_id, local_unit)
+
 
+@pytest.mark.parametrize("already_written", [False, True])
+def test_provider_write_payload(already_written, generic_charm_harness, mocker):
+    """Test 'Provider' updating unit data in a relation.
 
-def test_provider_update_relation_data_explicit_binding(generic_charm_harness, mocker):
-    """Test 'Provider' updating unit data in relations if explicit exporter address is defined."""
+    Relation data are not written again if the payload did not change.
+    """
     local_charm = generic_charm_harness.charm
     local_unit = local_charm.unit.name
     hostname = "test.machine.0"
@@ -53,15 +81,15 @@ def test_provider_update_relation_data_explicit_binding(generic_charm_harness, m
 
     relation = generic_charm_harness.model.relations["software-inventory"][0]
     endpoint = SoftwareInventoryProvider(charm=local_charm)
+    if already_written:
+        endpoint._write_payload(relation, endpoint._relation_payload())
+    update_spy = mocker.spy(relation.data[local_charm.unit], "update")
 
-    endpoint._update_relation_data(relation)
+    endpoint._write_payload(relation, endpoint._relation_payload())
 
-    expected_data = {
-        "hostname": hostname,
-        "model": endpoint.model.name,
-        "port": endpoint.port,
-    }
+    expected_data = _cfg(hostname, endpoint.port, endpoint.model.name)
     assert expected_data == generic_charm_harness.get_relation_data(rel_id, local_unit)
+    assert update_spy.call_count == (0 if already_written else 1)
 
 
 def test_provider_update_consumers(generic_charm_harness, mocker):
@@ -69,22 +97,36 @@ def test_provider_update_consumers(generic_charm_harness, mocker):
     relation_name = "software-inventory"
     new_port = "10500"
     new_address = "10.255.255.1"
-    update_relation_mock = mocker.patch.object(SoftwareInventoryProvider, "_update_relation_data")
+    write_payload_mock = mocker.patch.object(SoftwareInventoryProvider, "_write_payload")
 
     with generic_charm_harness.hooks_disabled():
         generic_charm_harness.add_relation(relation_name, "collector_1")
         generic_charm_harness.add_relation(relation_name, "collector_2")
 
-    expected_update_calls = []
-    for relation in generic_charm_harness.model.relations[relation_name]:
-        expected_update_calls.append(call(relation))
-
     endpoint = SoftwareInventoryProvider(charm=generic_charm_harness.charm)
     endpoint.update_consumers(new_port, new_address)
 
+    expected_payload = endpoint._relation_payload()
+    expected_update_calls = []
+    for relation in generic_charm_harness.model.relations[relation_name]:
+        expected_update_calls.append(call(relation, expected_payload))
+
     assert endpoint.port == new_port
     assert endpoint.bound_address == new_address
-    update_relation_mock.assert_has_calls(expected_update_calls)
+    assert expected_payload["port"] == new_port
+    write_payload_mock.assert_has_calls(expected_update_calls)
+
+
+def test_exporter_config_is_dataclass():
+    """Test that 'ExporterConfig' keeps behaving as a dataclass for library consumers."""
+    exporter = ExporterConfig("juju-unit.1", "5000", "test_model")
+    exporter.ingress_ip = "10.0.0.1"
+
+    assert asdict(exporter) == {
+        **_cfg("juju-unit.1", "5000", "test_model"),
+        "ingress_ip": "10.0.0.1",
+    }
+    assert exporter != ("juju-unit.1", "5000", "test_model", "10.0.0.1")
 
 
 def test_consumer_init():
@@ -106,18 +148,12 @@ def test_consumer_all_exporters(generic_charm_harness):
         rel_id = generic_charm_harness.add_relation(relation_name, "sw-exporter")
         for index, unit in enumerate(remote_units):
             generic_charm_harness.add_relation_unit(rel_id, unit)
-            unit_data = ExporterConfig(f"juju-unit.{index + 1}", "5000", "test_model")
-            unit_data_dict = asdict(unit_data)
-            unit_data_dict["ingress-address"] = f"10.0.0.{index + 1}"
-            generic_charm_harness.update_relation_data(rel_id, unit, unit_data_dict)
-            expected_data.append(
-                ExporterConfig(
-                    hostname=unit_data.hostname,
-                    port=unit_data.port,
-                    model=unit_data.model,
-                    ingress_ip=unit_data_dict["ingress-address"],
-                )
+            payload = _cfg(f"juju-unit.{index + 1}", "5000", "test_model")
+            ingress_ip = f"10.0.0.{index + 1}"
+            generic_charm_harness.update_relation_data(
+                rel_id, unit, {**payload, "ingress-address": ingress_ip}
             )
+            expected_data.append(ExporterConfig(**payload, ingress_ip=ingress_ip))
 
     consumer = SoftwareInventoryConsumer(generic_charm_harness.charm, relation_name)
 
@@ -125,3 +161,67 @@ def test_consumer_all_exporters(generic_charm_harness):
     assert len(all_exporters) == len(expected_data)
     for data in expected_data:
         assert data in all_exporters
+
+
+def test_provider_update_consumers_unchanged(generic_charm_harness, mocker):
+    """Test that Provider's 'update_consumers' skips update if port and address did not change."""
+    write_payload_mock = mocker.patch.object(SoftwareInventoryProvider, "_write_payload")
+
+    with generic_charm_harness.hooks_disabled():
+        generic_charm_harness.add_relation("software-inventory", "collector")
+
+    endpoint = SoftwareInventoryProvider(charm=generic_charm_harness.charm)
+    endpoint.update_consumers("10500", "10.255.255.1")
+    endpoint.update_consumers("10500", "10.255.255.1")
+
+    write_payload_mock.assert_called_once()
+
+
+def test_consumer_all_exporters_incomplete_data(generic_charm_harness):
+    """Test that Consumer endpoint skips Providers that did not set their data yet."""
+    relation_name = "software-inventory"
+
+    with generic_charm_harness.hooks_disabled():
+        rel_id = generic_charm_harness.add_relation(relation_name, "sw-exporter")
+        generic_charm_harness.add_relation_unit(rel_id, "sw-exporter/0")
+        generic_charm_harness.add_relation_unit(rel_id, "sw-exporter/1")
+        generic_charm_harness.update_relation_data(
+            rel_id,
+            "sw-exporter/0",
+            _cfg("juju-unit.1", "5000", "test_model"),
+        )
+        generic_charm_harness.update_relation_data(
+            rel_id, "sw-exporter/1", {"hostname": "juju-unit.2"}
+        )
+
+    consumer = SoftwareInventoryConsumer(generic_charm_harness.charm, relation_name)
+
+    assert [exporter.hostname for exporter in consumer.all_exporters()] == ["juju-unit.1"]
+
+
+def test_consumer_iter_exporters(generic_charm_harness):
+    """Test Consumer endpoint lazily yielding data of all related Providers."""
+    relation_name = "software-inventory"
+
+    with generic_charm_harness.hooks_disabled():
+        rel_id = generic_charm_harness.add_relation(relation_name, "sw-exporter")
+        for index in range(2):
+            unit = f"sw-exporter/{index}"
+            generic_charm_harness.add_relation_unit(rel_id, unit)
+            generic_charm_harness.update_relation_data(
+                rel_id,
+                unit,
+                {
+                    **_cfg(f"juju-unit.{index}", "5000", "test_model"),
+                    "ingress-address": f"10.0.0.{index}",
+                },
+            )
+
+    consumer = SoftwareInventoryConsumer(generic_charm_harness.charm, relation_name)
+    exporters = consumer.iter_exporters()
+
+    assert isinstance(exporters, GeneratorType)
+    assert sorted(exporters, key=lambda exporter: exporter.hostname) == [
+        ExporterConfig("juju-unit.0", "5000", "test_model", "10.0.0.0"),
+        ExporterConfig("juju-unit.1", "5000", "test_model", "10.0.0.1"),
+    ]